@@ -1,16 +1,45 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, render_template, request, send_from_directory, stream_with_context
 from flask_cors import CORS
-import json
+from datetime import datetime
+import orjson
 import os
 from ai_service import AIService
-from insight import Insight
+from insight import Insight, replica_sets_by_deployment, to_columns
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 CORS(app)
 
 # Initialize services
 ai_service = AIService()
-insight = Insight()
+insight = Insight(use_informers=os.getenv('INSIGHT_USE_INFORMERS', 'false').lower() == 'true')
+
+# Runs a request's cluster context fetch while the handler prepares the rest of the prompt.
+# Kept apart from insight's executor, whose workers must stay free for the list calls.
+context_executor = ThreadPoolExecutor(max_workers=8)
+
+SYSTEM_PROMPT_TEMPLATE = """
+You are a Kubernetes cluster expert assistant. You have access to real-time cluster information.
+
+Current Cluster Context (Namespace: {namespace}):
+{context_json}
+
+Based on this cluster information, answer the user's question. Provide specific details about:
+- Pod status and health
+- Resource usage and capacity
+- Configuration issues
+- Deployment status
+- Storage and networking
+- Recent events and problems
+
+If the user asks about cluster health, analyze the data and provide insights.
+Be specific and reference actual resource names and values from the context.{conversation_context}
+"""
+
+def ojsonify(obj, status=200):
+    """Serialize a response body with orjson (much faster than flask.jsonify on large contexts)"""
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                              status=status, mimetype='application/json')
 
 @app.route('/aiishere')
 def index():
@@ -30,39 +59,28 @@ def chat():
         user_message = data.get('message', '')
         namespace = data.get('namespace', 'code-analyzer')
         conversation_history = data.get('history', [])  # Array of previous messages
+        refresh = bool(data.get('refresh', False))  # Bypass the cached cluster context
         
         if not user_message:
-            return jsonify({'error': 'Message is required'}), 400
+            return ojsonify({'error': 'Message is required'}, 400)
         
-        # Get current cluster context
-        cluster_context = insight.get_cluster_context(namespace)
+        # Start fetching the cluster context; it is only needed once the prompt is assembled
+        context_future = context_executor.submit(insight.get_cluster_snapshot, namespace, force_refresh=refresh)
         
         # Build conversation context if history exists
         conversation_context = ""
         if conversation_history:
-            conversation_context = "\n\nPrevious conversation:\n"
+            lines = []
             for msg in conversation_history[-4:]:  # Keep last 4 messages for context
                 role = "User" if msg.get('role') == 'user' else "Assistant"
-                conversation_context += f"{role}: {msg.get('content', '')}\n"
+                lines.append(f"{role}: {msg.get('content', '')}")
+            conversation_context = "\n\nPrevious conversation:\n" + "\n".join(lines) + "\n"
+        
+        cluster_context, context_json = context_future.result()
         
         # Create a comprehensive prompt for the AI
-        system_context = f"""
-You are a Kubernetes cluster expert assistant. You have access to real-time cluster information.
-
-Current Cluster Context (Namespace: {namespace}):
-{json.dumps(cluster_context, indent=2)}
-
-Based on this cluster information, answer the user's question. Provide specific details about:
-- Pod status and health
-- Resource usage and capacity
-- Configuration issues
-- Deployment status
-- Storage and networking
-- Recent events and problems
-
-If the user asks about cluster health, analyze the data and provide insights.
-Be specific and reference actual resource names and values from the context.{conversation_context}
-"""
+        system_context = SYSTEM_PROMPT_TEMPLATE.format(namespace=namespace, context_json=context_json,
+                                                       conversation_context=conversation_context)
         
         full_prompt = f"{system_context}\n\nUser Question: {user_message}\n\nAnswer:"
         
@@ -70,34 +88,75 @@ Be specific and reference actual resource names and values from the context.{con
         ai_response = ai_service.generate_text(full_prompt, max_tokens=1500)
         
         print(f"AI Response: {ai_response}")
-        return jsonify({
+        return ojsonify({
             'response': ai_response,
             'cluster_context': cluster_context,
             'namespace': namespace
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
 
 @app.route('/api/cluster-status', methods=['GET'])
 def cluster_status():
     """Get current cluster status"""
     try:
         namespace = request.args.get('namespace', 'code-analyzer')
-        context = insight.get_cluster_context(namespace)
-        print(context)
-        return jsonify(context)
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        context = insight.get_cluster_context(namespace, force_refresh=refresh)
+        if request.args.get('layout') == 'columns':
+            context = {k: to_columns(k, v) if isinstance(v, list) else v for k, v in context.items()}
+        return ojsonify(context)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}, 500)
+
+@app.route('/api/cluster-status/stream', methods=['GET'])
+def cluster_status_stream():
+    """Stream the cluster status as newline-delimited JSON, one resource kind per line,
+    or with ?format=json as a single JSON object written one resource kind at a time"""
+    namespace = request.args.get('namespace', 'code-analyzer')
+    chunks = insight.iter_cluster_context_chunks(namespace)
+    columns = request.args.get('layout') == 'columns'
+    if request.args.get('format') == 'json':
+        return Response(stream_with_context(_json_object(namespace, chunks, columns)), mimetype='application/json')
+    if columns:
+        chunks = ((k, to_columns(k, v) if isinstance(v, list) else v) for k, v in chunks)
+    return Response(stream_with_context(_ndjson(namespace, chunks)), mimetype='application/x-ndjson')
+
+def _ndjson(namespace, chunks):
+    """Encode context chunks as NDJSON lines, led by the context's timestamp and namespace"""
+    yield orjson.dumps({'timestamp': datetime.now(), 'namespace': namespace}) + b'\n'
+    for key, value in chunks:
+        yield orjson.dumps({key: value}, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+
+def _json_object(namespace, chunks, columns=False):
+    """Encode context chunks as the members of one JSON object, the same shape /api/cluster-status returns"""
+    yield orjson.dumps({'timestamp': datetime.now(), 'namespace': namespace})[:-1]
+    errors = {}
+    joined = {'deployments': [], 'replica_sets': []}
+    for key, value in chunks:
+        if key == 'errors':
+            # Held back so failures from every call end up in a single errors member
+            errors.update(value)
+            continue
+        if key in joined:
+            # Kept for the indexes, which need both kinds and so are written last
+            joined[key] = value
+        if columns and isinstance(value, list):
+            value = to_columns(key, value)
+        yield b',' + orjson.dumps(key) + b':' + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    indexes = {'rs_by_deployment': replica_sets_by_deployment(joined['deployments'], joined['replica_sets'])}
+    yield b',"errors":' + orjson.dumps(errors) + b',"indexes":' + orjson.dumps(indexes) + b'}'
 
 @app.route('/api/health-check', methods=['GET'])
 def health_check():
     """Simple health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'Kubernetes Insights AI Chat'})
+    return ojsonify({'status': 'healthy', 'service': 'Kubernetes Insights AI Chat'})
 
 if __name__ == '__main__':
     # Create directories if they don't exist
     os.makedirs('templates', exist_ok=True)
     os.makedirs('static', exist_ok=True)
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Local development only; the container serves the app with gunicorn (see gunicorn_conf.py)
+    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,12 @@
+import os
+
+bind = "0.0.0.0:5000"
+
+# Each worker holds its own cluster context cache, list-call executor and (optionally) informers,
+# so a few processes with many threads beat one process per core in the 512Mi pod limit
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+timeout = 30
+keepalive = 15
@@ -0,0 +1,154 @@
+from kubernetes.client.rest import ApiException
+from k8s_client import list_pages
+from threading import Event, Lock, Thread
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Seconds each watch request stays open before it is renewed from the last resourceVersion
+WATCH_TIMEOUT = 300
+# Seconds to wait before the first retry after the list or watch failed; doubled per consecutive
+# failure up to MAX_RETRY_DELAY, so a kind that keeps failing (RBAC, a missing API) backs off
+RETRY_DELAY = 5
+MAX_RETRY_DELAY = 300
+
+
+def _watch_events(response):
+    """Yield the events of a watch response as parsed JSON dicts, one per line."""
+    buffer = b""
+    for chunk in response.stream(amt=None, decode_content=True):
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+class Informer:
+    def __init__(self, list_fn, transform=None, **kwargs):
+        """Mirror the objects returned by a list call, kept current by a background watch.
+
+        Objects are raw JSON dicts, or whatever transform projects each of them to as it is
+        added or modified, so readers get a ready-made view.
+        """
+        self.list_fn = list_fn
+        self.transform = transform
+        self.kwargs = kwargs
+        self._objects = {}
+        self._lock = Lock()
+        self._synced = Event()
+        self._attempted = Event()
+        self._stopped = Event()
+        self._error = None
+        self._failures = 0
+        self._response = None
+
+        self._thread = Thread(target=self._run, name=f"informer-{list_fn.__name__}", daemon=True)
+        self._thread.start()
+
+    def items(self, timeout=30):
+        """Return a snapshot of the cached objects, waiting for the initial list if needed."""
+        if not self._synced.is_set():
+            self._attempted.wait(timeout)
+            if not self._synced.is_set():
+                raise self._error or TimeoutError(f"{self.list_fn.__name__} has not synced yet")
+
+        with self._lock:
+            return list(self._objects.values())
+
+    def stop(self):
+        """Stop watching, closing the open watch request so the thread exits promptly."""
+        self._stopped.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def _list(self):
+        """Replace the cache with a full list and return the resourceVersion to watch from."""
+        resource_version = None
+        objects = {}
+        for page in list_pages(self.list_fn, **self.kwargs):
+            # Every page is consistent with the first page's resourceVersion
+            resource_version = resource_version or page["metadata"]["resourceVersion"]
+            for obj in page["items"] or ():
+                objects[obj["metadata"]["uid"]] = self._project(obj)
+
+        with self._lock:
+            self._objects = objects
+        self._synced.set()
+        self._attempted.set()
+        return resource_version
+
+    def _project(self, obj):
+        return self.transform(obj) if self.transform else obj
+
+    def _run(self):
+        resource_version = None
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                    if self._stopped.is_set():
+                        break  # Stopped while listing; don't open a watch nobody will close
+                resource_version = self._watch(resource_version)
+            except ApiException as e:
+                if e.status == 410:
+                    # Our resourceVersion is too old to watch from; re-list to resync
+                    resource_version = None
+                    continue
+                self._retry_after(e)
+            except Exception as e:
+                if self._stopped.is_set():
+                    break  # stop() closed the watch under us
+                self._retry_after(e)
+
+    def _watch(self, resource_version):
+        """Apply watch events from resource_version on until the request times out.
+
+        Returns the resourceVersion to resume from, or None when the cache must be re-listed.
+        The watch is issued directly and each line parsed with orjson, so events are never
+        deserialized into the client's model classes.
+        """
+        response = self.list_fn(watch=True, resource_version=resource_version, allow_watch_bookmarks=True,
+                                timeout_seconds=WATCH_TIMEOUT, _preload_content=False, **self.kwargs)
+        self._response = response
+        # A stop() that came in before the response was published couldn't close it
+        if self._stopped.is_set():
+            response.close()
+            return resource_version
+
+        try:
+            for event in _watch_events(response):
+                obj = event["object"]
+                if event["type"] == "ERROR":
+                    if obj.get("code") == 410:
+                        # Events up to our resourceVersion were compacted away; re-list to resync
+                        return None
+                    raise ApiException(status=obj.get("code"), reason=f"{obj.get('reason')}: {obj.get('message')}")
+
+                # Bookmarks only advance the resourceVersion, keeping it fresh while nothing changes
+                metadata = obj["metadata"]
+                resource_version = metadata["resourceVersion"]
+                if event["type"] == "DELETED":
+                    with self._lock:
+                        self._objects.pop(metadata["uid"], None)
+                elif event["type"] != "BOOKMARK":
+                    projected = self._project(obj)
+                    with self._lock:
+                        self._objects[metadata["uid"]] = projected
+        finally:
+            self._response = None
+            response.release_conn()
+
+        # The watch ran its course, so whatever failed before has recovered
+        self._failures = 0
+        return resource_version
+
+    def _retry_after(self, error):
+        """Record a failed list/watch so waiting readers see it, then back off."""
+        self._error = error
+        self._attempted.set()
+        delay = min(RETRY_DELAY * 2 ** self._failures, MAX_RETRY_DELAY)
+        self._failures += 1
+        logger.warning("Informer for %s failed, retrying in %ss: %r", self.list_fn.__name__, delay, error)
+        self._stopped.wait(delay)
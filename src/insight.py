@@ -1,22 +1,521 @@
-from kubernetes import client, config
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from kubernetes import client
+from kubernetes.client.rest import ApiException
 from datetime import datetime
+from informer import Informer
+from k8s_client import MAX_WATCHES, get_api_client, list_pages
+from threading import Lock
+import heapq
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Shared across requests so the list calls of get_cluster_context run concurrently. Bounded so
+# bursts of requests can't flood the apiserver with parallel lists.
+MAX_WORKERS = 6
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# Annotations under this prefix are kubectl bookkeeping and left out of pod info
+_KUBECTL_PREFIX = "kubectl.kubernetes.io"
+
+# Seconds a namespace's context is reused, enough to absorb a page load's burst of calls
+CONTEXT_TTL = 3.0
+# Cluster-scoped kinds (nodes, PVs) change on a scale of minutes, so their built entries are
+# kept longer and shared by every namespace's context: seconds per kind
+CLUSTER_TTLS = {"nodes": 30.0, "persistent_volumes": 15.0}
+
+# Namespaces whose informers are kept running; the least recently used one beyond this is stopped,
+# so callers naming arbitrary namespaces can't pile up watch threads and connections. Each namespace
+# holds a watch per namespaced kind (11) next to the 2 cluster-scoped ones, so this is as many as
+# fit in the pooled connections k8s_client sets aside for watches.
+MAX_INFORMER_NAMESPACES = (MAX_WATCHES - 2) // 11
+# Namespaces that keep a fan-out lock; beyond this the least recently used lock is dropped
+MAX_NAMESPACE_LOCKS = 128
+
+
+def _paged(list_fn, **kwargs):
+    """Yield every object of a list call as a raw JSON dict, one page at a time."""
+    for page in list_pages(list_fn, **kwargs):
+        yield from page["items"] or ()
+
+
+def _get(obj, *keys):
+    """Walk nested dicts, returning None as soon as a key is missing."""
+    for key in keys:
+        if not obj:
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def _build_node_info(node):
+    status = node["status"]
+    ready = "NotReady"
+    conditions = []
+    for c in status.get("conditions") or ():
+        if c["type"] == "Ready" and c["status"] == "True":
+            ready = "Ready"
+        conditions.append({"type": c["type"], "status": c["status"]})
+
+    capacity = status.get("capacity") or {}
+    return {
+        "name": node["metadata"]["name"],
+        "status": ready,
+        "cpu_capacity": capacity.get("cpu"),
+        "memory_capacity": capacity.get("memory"),
+        "conditions": conditions
+    }
+
+
+def _build_container_info(container):
+    resources = container.get("resources") or {}
+    return {
+        "name": container["name"],
+        "image": container.get("image"),
+        "ports": [{"container_port": p["containerPort"], "protocol": p.get("protocol")} for p in container.get("ports") or ()],
+        "resources": {
+            "requests": resources.get("requests") or {},
+            "limits": resources.get("limits") or {}
+        },
+        "env_vars": len(container.get("env") or ()),
+        "volume_mounts": [{"name": vm["name"], "mount_path": vm["mountPath"]} for vm in container.get("volumeMounts") or ()]
+    }
+
+
+def _build_container_status_info(status):
+    state = status.get("state") or {}
+    if "running" in state:
+        state_info = {
+            "status": "running",
+            "started_at": state["running"].get("startedAt")
+        }
+    elif "waiting" in state:
+        state_info = {
+            "status": "waiting",
+            "reason": state["waiting"].get("reason"),
+            "message": state["waiting"].get("message")
+        }
+    elif "terminated" in state:
+        terminated = state["terminated"]
+        state_info = {
+            "status": "terminated",
+            "reason": terminated.get("reason"),
+            "exit_code": terminated.get("exitCode"),
+            "finished_at": terminated.get("finishedAt")
+        }
+    else:
+        state_info = {}
+
+    terminated = _get(status, "lastState", "terminated")
+    if terminated is not None:
+        last_state_info = {
+            "status": "terminated",
+            "reason": terminated.get("reason"),
+            "exit_code": terminated.get("exitCode"),
+            "finished_at": terminated.get("finishedAt")
+        }
+    else:
+        last_state_info = {}
+
+    return {
+        "name": status["name"],
+        "ready": status.get("ready"),
+        "restart_count": status.get("restartCount", 0),
+        "state": state_info,
+        "last_state": last_state_info
+    }
+
+
+def _build_volume_info(volume):
+    volume_info = {
+        "name": volume["name"],
+        "type": "unknown"
+    }
+
+    # Sources such as emptyDir can be an empty dict, so test for the key rather than truthiness
+    if "configMap" in volume:
+        volume_info["type"] = "configMap"
+        volume_info["config_map_name"] = volume["configMap"].get("name")
+    elif "secret" in volume:
+        volume_info["type"] = "secret"
+        volume_info["secret_name"] = volume["secret"].get("secretName")
+    elif "persistentVolumeClaim" in volume:
+        volume_info["type"] = "persistentVolumeClaim"
+        volume_info["pvc_name"] = volume["persistentVolumeClaim"].get("claimName")
+    elif "emptyDir" in volume:
+        volume_info["type"] = "emptyDir"
+    elif "hostPath" in volume:
+        volume_info["type"] = "hostPath"
+        volume_info["host_path"] = volume["hostPath"].get("path")
+
+    return volume_info
+
+
+def _build_pod_info(pod):
+    metadata = pod["metadata"]
+    spec = pod["spec"]
+    status = pod.get("status") or {}
+
+    # Ready count, restart total and per-container statuses in a single pass
+    ready = 0
+    restart_count = 0
+    container_statuses = []
+    for cs in status.get("containerStatuses") or ():
+        if cs.get("ready"):
+            ready += 1
+        restart_count += cs.get("restartCount", 0)
+        container_statuses.append(_build_container_status_info(cs))
+
+    conditions = [
+        {
+            "type": condition["type"],
+            "status": condition["status"],
+            "reason": condition.get("reason"),
+            "message": condition.get("message"),
+            "last_transition_time": condition.get("lastTransitionTime")
+        }
+        for condition in status.get("conditions") or ()
+    ]
+
+    containers = spec["containers"]
+    return {
+        "name": metadata["name"],
+        "status": status.get("phase"),
+        "ready": ready,
+        "total_containers": len(containers),
+        "restart_count": restart_count,
+        "node": spec.get("nodeName"),
+        "created": metadata.get("creationTimestamp"),
+        "labels": metadata.get("labels") or {},
+        "annotations": {k: v for k, v in (metadata.get("annotations") or {}).items() if not k.startswith(_KUBECTL_PREFIX)},
+        "service_account": spec.get("serviceAccountName"),
+        "restart_policy": spec.get("restartPolicy"),
+        "dns_policy": spec.get("dnsPolicy"),
+        "pod_ip": status.get("podIP"),
+        "host_ip": status.get("hostIP"),
+        "qos_class": status.get("qosClass"),
+        "containers": [_build_container_info(c) for c in containers],
+        "container_statuses": container_statuses,
+        "conditions": conditions,
+        "volumes": [_build_volume_info(v) for v in spec.get("volumes") or ()]
+    }
+
+
+def _build_deployment_info(deployment):
+    status = deployment.get("status") or {}
+    return {
+        "name": deployment["metadata"]["name"],
+        "replicas": deployment["spec"].get("replicas"),
+        "ready_replicas": status.get("readyReplicas", 0),
+        "available_replicas": status.get("availableReplicas", 0)
+    }
+
+
+def _build_service_info(service):
+    spec = service["spec"]
+    return {
+        "name": service["metadata"]["name"],
+        "type": spec.get("type"),
+        "cluster_ip": spec.get("clusterIP")
+    }
+
+
+def _build_event_info(event):
+    involved = event["involvedObject"]
+    return {
+        "type": event.get("type"),
+        "reason": event.get("reason"),
+        "message": event.get("message"),
+        "object": f"{involved.get('kind')}/{involved.get('name')}"
+    }
+
+
+def _build_pv_info(pv):
+    spec = pv["spec"]
+    return {
+        "name": pv["metadata"]["name"],
+        "capacity": _get(spec, "capacity", "storage"),
+        "access_modes": spec.get("accessModes") or [],
+        "status": _get(pv, "status", "phase"),
+        "reclaim_policy": spec.get("persistentVolumeReclaimPolicy"),
+        "storage_class": spec.get("storageClassName")
+    }
+
+
+def _build_pvc_info(pvc):
+    spec = pvc["spec"]
+    status = pvc.get("status") or {}
+    return {
+        "name": pvc["metadata"]["name"],
+        "status": status.get("phase"),
+        "capacity": _get(status, "capacity", "storage"),
+        "access_modes": spec.get("accessModes") or [],
+        "storage_class": spec.get("storageClassName"),
+        "volume_name": spec.get("volumeName")
+    }
+
+
+def _build_config_map_info(cm):
+    return {
+        "name": cm["metadata"]["name"],
+        "data_keys": list(cm.get("data") or ()),
+        "binary_data_keys": list(cm.get("binaryData") or ())
+    }
+
+
+def _build_secret_info(secret):
+    return {
+        "name": secret["metadata"]["name"],
+        "type": secret.get("type"),
+        "data_keys": list(secret.get("data") or ())
+    }
+
+
+def _build_ingress_info(ingress):
+    spec = ingress["spec"]
+    return {
+        "name": ingress["metadata"]["name"],
+        "hosts": [rule["host"] for rule in spec.get("rules") or () if rule.get("host")],
+        "tls": bool(spec.get("tls")),
+        "class": spec.get("ingressClassName")
+    }
+
+
+def _build_replica_set_info(rs):
+    metadata = rs["metadata"]
+    status = rs.get("status") or {}
+    owners = metadata.get("ownerReferences")
+    return {
+        "name": metadata["name"],
+        "replicas": rs["spec"].get("replicas"),
+        "ready_replicas": status.get("readyReplicas", 0),
+        "available_replicas": status.get("availableReplicas", 0),
+        "owner": owners[0]["name"] if owners else None
+    }
+
+
+def _build_daemon_set_info(ds):
+    status = ds.get("status") or {}
+    return {
+        "name": ds["metadata"]["name"],
+        "desired": status.get("desiredNumberScheduled", 0),
+        "current": status.get("currentNumberScheduled", 0),
+        "ready": status.get("numberReady", 0),
+        "available": status.get("numberAvailable", 0)
+    }
+
+
+def _build_stateful_set_info(ss):
+    status = ss.get("status") or {}
+    return {
+        "name": ss["metadata"]["name"],
+        "replicas": ss["spec"].get("replicas"),
+        "ready_replicas": status.get("readyReplicas", 0),
+        "current_replicas": status.get("currentReplicas", 0),
+        "updated_replicas": status.get("updatedReplicas", 0)
+    }
+
+
+def _event_ts(event):
+    # RFC 3339 UTC timestamps sort chronologically as strings
+    return event["metadata"].get("creationTimestamp") or ""
+
+
+def _recent_events(events):
+    """Keep only the last 5 events."""
+    return heapq.nlargest(5, events, key=_event_ts)
+
+
+def replica_sets_by_deployment(deployments, replica_sets):
+    """Map each deployment's name to the names of the replica sets it owns."""
+    deployment_names = {deployment["name"] for deployment in deployments}
+    index = {}
+    for rs in replica_sets:
+        owner = rs["owner"]
+        if owner in deployment_names:
+            index.setdefault(owner, []).append(rs["name"])
+    return index
+
+
+def to_columns(kind, entries):
+    """Lay a kind's entries out column-wise: one list per field instead of one dict per object.
+
+    Field names are then stored once per kind rather than once per object, which shrinks the
+    payload and lets clients aggregate a field (e.g. restart_count) without walking dicts.
+    A kind always has the same columns, so one without objects has an empty list per field.
+    """
+    return {field: [entry[field] for entry in entries] for field in _FIELDS[kind]}
+
+
+class _InformerCache(LRUCache):
+    """LRU of each namespace's informers, keyed by namespace, that stops a namespace's watches on eviction."""
+
+    def popitem(self):
+        namespace, informers = super().popitem()
+        for informer in informers.values():
+            informer.stop()
+        return namespace, informers
+
+
+# The fields each builder produces, in order: the columns of a kind in the columnar layout
+_FIELDS = {
+    "nodes": ("name", "status", "cpu_capacity", "memory_capacity", "conditions"),
+    "pods": ("name", "status", "ready", "total_containers", "restart_count", "node", "created", "labels",
+             "annotations", "service_account", "restart_policy", "dns_policy", "pod_ip", "host_ip", "qos_class",
+             "containers", "container_statuses", "conditions", "volumes"),
+    "deployments": ("name", "replicas", "ready_replicas", "available_replicas"),
+    "services": ("name", "type", "cluster_ip"),
+    "events": ("type", "reason", "message", "object"),
+    "persistent_volumes": ("name", "capacity", "access_modes", "status", "reclaim_policy", "storage_class"),
+    "persistent_volume_claims": ("name", "status", "capacity", "access_modes", "storage_class", "volume_name"),
+    "config_maps": ("name", "data_keys", "binary_data_keys"),
+    "secrets": ("name", "type", "data_keys"),
+    "ingresses": ("name", "hosts", "tls", "class"),
+    "replica_sets": ("name", "replicas", "ready_replicas", "available_replicas", "owner"),
+    "daemon_sets": ("name", "desired", "current", "ready", "available"),
+    "stateful_sets": ("name", "replicas", "ready_replicas", "current_replicas", "updated_replicas")
+}
+
+
+_BUILDERS = {
+    "nodes": _build_node_info,
+    "pods": _build_pod_info,
+    "deployments": _build_deployment_info,
+    "services": _build_service_info,
+    "events": _build_event_info,
+    "persistent_volumes": _build_pv_info,
+    "persistent_volume_claims": _build_pvc_info,
+    "config_maps": _build_config_map_info,
+    "secrets": _build_secret_info,
+    "ingresses": _build_ingress_info,
+    "replica_sets": _build_replica_set_info,
+    "daemon_sets": _build_daemon_set_info,
+    "stateful_sets": _build_stateful_set_info
+}
+
 
 class Insight:
-    def __init__(self):
-        """Initialize the Kubernetes client configuration."""
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
-        
-        self.v1 = client.CoreV1Api()
-        self.apps_v1 = client.AppsV1Api()
-        self.networking_v1 = client.NetworkingV1Api()
-
-    def get_cluster_context(self, namespace="code-analyzer"):
-        """Get comprehensive cluster context data."""
+    def __init__(self, api_client=None, use_informers=False):
+        """Initialize the Kubernetes API clients on top of a shared ApiClient (the process-wide one by default).
+
+        With use_informers, each kind is listed once per namespace and then kept current by
+        a background watch, so building a context needs no apiserver round-trips. Watches are
+        kept for the MAX_INFORMER_NAMESPACES most recently requested namespaces.
+        """
+        self.api_client = api_client = api_client or get_api_client()
+        self.v1 = client.CoreV1Api(api_client)
+        self.apps_v1 = client.AppsV1Api(api_client)
+        self.networking_v1 = client.NetworkingV1Api(api_client)
+
+        # (context key, bound list method, namespaced, extra kwargs), resolved once rather than per request
+        self._list_calls = (
+            ("nodes", self.v1.list_node, False, {}),
+            ("pods", self.v1.list_namespaced_pod, True, {"field_selector": "status.phase!=Succeeded"}),
+            ("deployments", self.apps_v1.list_namespaced_deployment, True, {}),
+            ("services", self.v1.list_namespaced_service, True, {}),
+            ("events", self.v1.list_namespaced_event, True, {"field_selector": "type!=Normal"}),
+            ("persistent_volumes", self.v1.list_persistent_volume, False, {}),
+            ("persistent_volume_claims", self.v1.list_namespaced_persistent_volume_claim, True, {}),
+            ("config_maps", self.v1.list_namespaced_config_map, True, {}),
+            ("secrets", self.v1.list_namespaced_secret, True, {}),
+            ("ingresses", self.networking_v1.list_namespaced_ingress, True, {}),
+            ("replica_sets", self.apps_v1.list_namespaced_replica_set, True, {}),
+            ("daemon_sets", self.apps_v1.list_namespaced_daemon_set, True, {}),
+            ("stateful_sets", self.apps_v1.list_namespaced_stateful_set, True, {})
+        )
+
+        self._ctx_cache = TTLCache(maxsize=32, ttl=CONTEXT_TTL)
+        self._ctx_lock = Lock()
+        self._ns_locks = LRUCache(maxsize=MAX_NAMESPACE_LOCKS)
+        # One cache and lock per kind, so nodes and PVs are fetched in parallel but each only once at a time
+        cluster_kinds = [key for key, _, namespaced, _ in self._list_calls if not namespaced]
+        self._cluster_caches = {key: TTLCache(maxsize=1, ttl=CLUSTER_TTLS[key]) for key in cluster_kinds}
+        self._cluster_locks = {key: Lock() for key in cluster_kinds}
+
+        self.use_informers = use_informers
+        self._informers = _InformerCache(maxsize=MAX_INFORMER_NAMESPACES)
+        self._cluster_informers = {}
+        self._informers_lock = Lock()
+
+    def get_cluster_context(self, namespace="code-analyzer", force_refresh=False):
+        """Get comprehensive cluster context data, reusing a snapshot younger than CONTEXT_TTL."""
+        return self.get_cluster_snapshot(namespace, force_refresh)[0]
+
+    def get_cluster_snapshot(self, namespace="code-analyzer", force_refresh=False):
+        """Get the cluster context along with its indented JSON text, both cached together."""
+        with self._ctx_lock:
+            ns_lock = self._ns_locks.get(namespace)
+            if ns_lock is None:
+                ns_lock = self._ns_locks[namespace] = Lock()
+
+        # Concurrent requests for the same namespace wait for a single fan-out
+        with ns_lock:
+            if not force_refresh:
+                with self._ctx_lock:
+                    snapshot = self._ctx_cache.get(namespace)
+                if snapshot is not None:
+                    return snapshot
+
+            context = self._build_cluster_context(namespace, force_refresh)
+            snapshot = (context, orjson.dumps(context, option=orjson.OPT_INDENT_2).decode())
+            # Cached even with errors: a kind that keeps failing (RBAC, a missing API, throttling)
+            # must not turn every request into a full fan-out, and CONTEXT_TTL bounds staleness
+            with self._ctx_lock:
+                self._ctx_cache[namespace] = snapshot
+            return snapshot
+
+    def _cached_items(self, list_fn, transform=None, **kwargs):
+        """Read a list call's objects from its informer, starting the informer on first use."""
+        namespace = kwargs.get("namespace")
+        with self._informers_lock:
+            # Cluster-scoped kinds are shared by every namespace, so their informers are never evicted
+            informers = self._informers.get(namespace) if namespace else self._cluster_informers
+            if informers is None:
+                informers = self._informers[namespace] = {}
+            informer = informers.get(list_fn)
+            if informer is None:
+                informer = informers[list_fn] = Informer(list_fn, transform, **kwargs)
+        return informer.items()
+
+    def _collect(self, key, list_fn, **kwargs):
+        """List one kind of object and build its context entries."""
+        if key == "events":
+            # Events need their timestamps to pick the most recent, so informers keep them raw
+            events = self._cached_items(list_fn, **kwargs) if self.use_informers else _paged(list_fn, **kwargs)
+            return [_build_event_info(event) for event in _recent_events(events)]
+
+        builder = _BUILDERS[key]
+        if self.use_informers:
+            # The informer builds each entry as its object changes, so reading is just a copy
+            return self._cached_items(list_fn, builder, **kwargs)
+        # Map the builder over each page directly rather than resuming a generator per object
+        entries = []
+        for page in list_pages(list_fn, **kwargs):
+            entries.extend(map(builder, page["items"] or ()))
+        return entries
+
+    def _collect_cluster_scoped(self, key, list_fn, force_refresh=False, **kwargs):
+        """Build a cluster-scoped kind's entries, listing it at most once every CLUSTER_TTLS[key] seconds."""
+        if self.use_informers:
+            # The informer's watch already keeps the entries current; caching them would only age them
+            return self._collect(key, list_fn, **kwargs)
+
+        cache = self._cluster_caches[key]
+        with self._cluster_locks[key]:
+            if not force_refresh:
+                entries = cache.get(key)
+                if entries is not None:
+                    return entries
+
+            entries = cache[key] = self._collect(key, list_fn, **kwargs)
+            return entries
+
+    def _build_cluster_context(self, namespace, force_refresh=False):
+        """Query the cluster for the context of a namespace."""
         context = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "namespace": namespace,
             "nodes": [],
             "pods": [],
@@ -30,279 +529,42 @@ class Insight:
             "ingresses": [],
             "replica_sets": [],
             "daemon_sets": [],
-            "stateful_sets": []
+            "stateful_sets": [],
+            "errors": {}
+        }
+        for key, value in self.iter_cluster_context_chunks(namespace, force_refresh):
+            if key == "errors":
+                context["errors"].update(value)
+            else:
+                context[key] = value
+        # Precomputed joins, so consumers don't rescan one kind's entries for each of another's
+        context["indexes"] = {
+            "rs_by_deployment": replica_sets_by_deployment(context["deployments"], context["replica_sets"])
         }
-        
-        try:
-            # Get Nodes
-            nodes = self.v1.list_node()
-            for node in nodes.items:
-                node_info = {
-                    "name": node.metadata.name,
-                    "status": "Ready" if any(c.type == "Ready" and c.status == "True" 
-                                           for c in node.status.conditions) else "NotReady",
-                    "cpu_capacity": node.status.capacity.get("cpu"),
-                    "memory_capacity": node.status.capacity.get("memory"),
-                    "conditions": [{"type": c.type, "status": c.status} for c in node.status.conditions]
-                }
-                context["nodes"].append(node_info)
-            
-            # Get Pods
-            pods = self.v1.list_namespaced_pod(namespace=namespace)
-            for pod in pods.items:
-                # Container details
-                containers = []
-                for container in pod.spec.containers:
-                    container_info = {
-                        "name": container.name,
-                        "image": container.image,
-                        "ports": [{"container_port": p.container_port, "protocol": p.protocol} for p in (container.ports or [])],
-                        "resources": {
-                            "requests": container.resources.requests if container.resources and container.resources.requests else {},
-                            "limits": container.resources.limits if container.resources and container.resources.limits else {}
-                        },
-                        "env_vars": len(container.env or []),
-                        "volume_mounts": [{"name": vm.name, "mount_path": vm.mount_path} for vm in (container.volume_mounts or [])]
-                    }
-                    containers.append(container_info)
-                
-                # Container statuses
-                container_statuses = []
-                if pod.status.container_statuses:
-                    for status in pod.status.container_statuses:
-                        status_info = {
-                            "name": status.name,
-                            "ready": status.ready,
-                            "restart_count": status.restart_count,
-                            "state": {},
-                            "last_state": {}
-                        }
-                        
-                        # Current state
-                        if status.state.running:
-                            status_info["state"] = {
-                                "status": "running",
-                                "started_at": status.state.running.started_at.isoformat() if status.state.running.started_at else None
-                            }
-                        elif status.state.waiting:
-                            status_info["state"] = {
-                                "status": "waiting",
-                                "reason": status.state.waiting.reason,
-                                "message": status.state.waiting.message
-                            }
-                        elif status.state.terminated:
-                            status_info["state"] = {
-                                "status": "terminated",
-                                "reason": status.state.terminated.reason,
-                                "exit_code": status.state.terminated.exit_code,
-                                "finished_at": status.state.terminated.finished_at.isoformat() if status.state.terminated.finished_at else None
-                            }
-                        
-                        # Last state
-                        if status.last_state and status.last_state.terminated:
-                            status_info["last_state"] = {
-                                "status": "terminated",
-                                "reason": status.last_state.terminated.reason,
-                                "exit_code": status.last_state.terminated.exit_code,
-                                "finished_at": status.last_state.terminated.finished_at.isoformat() if status.last_state.terminated.finished_at else None
-                            }
-                        
-                        container_statuses.append(status_info)
-                
-                # Pod conditions
-                conditions = []
-                if pod.status.conditions:
-                    for condition in pod.status.conditions:
-                        condition_info = {
-                            "type": condition.type,
-                            "status": condition.status,
-                            "reason": condition.reason,
-                            "message": condition.message,
-                            "last_transition_time": condition.last_transition_time.isoformat() if condition.last_transition_time else None
-                        }
-                        conditions.append(condition_info)
-                
-                # Volumes
-                volumes = []
-                if pod.spec.volumes:
-                    for volume in pod.spec.volumes:
-                        volume_info = {
-                            "name": volume.name,
-                            "type": "unknown"
-                        }
-                        
-                        if volume.config_map:
-                            volume_info["type"] = "configMap"
-                            volume_info["config_map_name"] = volume.config_map.name
-                        elif volume.secret:
-                            volume_info["type"] = "secret"
-                            volume_info["secret_name"] = volume.secret.secret_name
-                        elif volume.persistent_volume_claim:
-                            volume_info["type"] = "persistentVolumeClaim"
-                            volume_info["pvc_name"] = volume.persistent_volume_claim.claim_name
-                        elif volume.empty_dir:
-                            volume_info["type"] = "emptyDir"
-                        elif volume.host_path:
-                            volume_info["type"] = "hostPath"
-                            volume_info["host_path"] = volume.host_path.path
-                        
-                        volumes.append(volume_info)
-                
-                pod_info = {
-                    "name": pod.metadata.name,
-                    "status": pod.status.phase,
-                    "ready": sum(1 for c in (pod.status.container_statuses or []) if c.ready),
-                    "total_containers": len(pod.spec.containers),
-                    "restart_count": sum(c.restart_count for c in (pod.status.container_statuses or [])),
-                    "node": pod.spec.node_name,
-                    "created": pod.metadata.creation_timestamp.isoformat() if pod.metadata.creation_timestamp else None,
-                    "labels": pod.metadata.labels or {},
-                    "annotations": {k: v for k, v in (pod.metadata.annotations or {}).items() if not k.startswith("kubectl.kubernetes.io")},
-                    "service_account": pod.spec.service_account_name,
-                    "restart_policy": pod.spec.restart_policy,
-                    "dns_policy": pod.spec.dns_policy,
-                    "pod_ip": pod.status.pod_ip,
-                    "host_ip": pod.status.host_ip,
-                    "qos_class": pod.status.qos_class,
-                    "containers": containers,
-                    "container_statuses": container_statuses,
-                    "conditions": conditions,
-                    "volumes": volumes
-                }
-                context["pods"].append(pod_info)
-            
-            # Get Deployments
-            deployments = self.apps_v1.list_namespaced_deployment(namespace=namespace)
-            for deployment in deployments.items:
-                deployment_info = {
-                    "name": deployment.metadata.name,
-                    "replicas": deployment.spec.replicas,
-                    "ready_replicas": deployment.status.ready_replicas or 0,
-                    "available_replicas": deployment.status.available_replicas or 0
-                }
-                context["deployments"].append(deployment_info)
-            
-            # Get Services
-            services = self.v1.list_namespaced_service(namespace=namespace)
-            for service in services.items:
-                service_info = {
-                    "name": service.metadata.name,
-                    "type": service.spec.type,
-                    "cluster_ip": service.spec.cluster_ip
-                }
-                context["services"].append(service_info)
-            
-            # Get Recent Events (last 5)
-            events = self.v1.list_namespaced_event(namespace=namespace)
-            recent_events = sorted(events.items, 
-                                 key=lambda x: x.metadata.creation_timestamp or datetime.min, 
-                                 reverse=True)[:5]
-            for event in recent_events:
-                event_info = {
-                    "type": event.type,
-                    "reason": event.reason,
-                    "message": event.message,
-                    "object": f"{event.involved_object.kind}/{event.involved_object.name}"
-                }
-                context["events"].append(event_info)
-            
-            # Get Persistent Volumes (cluster-wide)
-            pvs = self.v1.list_persistent_volume()
-            for pv in pvs.items:
-                pv_info = {
-                    "name": pv.metadata.name,
-                    "capacity": pv.spec.capacity.get("storage") if pv.spec.capacity else None,
-                    "access_modes": pv.spec.access_modes or [],
-                    "status": pv.status.phase,
-                    "reclaim_policy": pv.spec.persistent_volume_reclaim_policy,
-                    "storage_class": pv.spec.storage_class_name
-                }
-                context["persistent_volumes"].append(pv_info)
-            
-            # Get Persistent Volume Claims
-            pvcs = self.v1.list_namespaced_persistent_volume_claim(namespace=namespace)
-            for pvc in pvcs.items:
-                pvc_info = {
-                    "name": pvc.metadata.name,
-                    "status": pvc.status.phase,
-                    "capacity": pvc.status.capacity.get("storage") if pvc.status.capacity else None,
-                    "access_modes": pvc.spec.access_modes or [],
-                    "storage_class": pvc.spec.storage_class_name,
-                    "volume_name": pvc.spec.volume_name
-                }
-                context["persistent_volume_claims"].append(pvc_info)
-            
-            # Get ConfigMaps
-            config_maps = self.v1.list_namespaced_config_map(namespace=namespace)
-            for cm in config_maps.items:
-                cm_info = {
-                    "name": cm.metadata.name,
-                    "data_keys": list(cm.data.keys()) if cm.data else [],
-                    "binary_data_keys": list(cm.binary_data.keys()) if cm.binary_data else []
-                }
-                context["config_maps"].append(cm_info)
-            
-            # Get Secrets
-            secrets = self.v1.list_namespaced_secret(namespace=namespace)
-            for secret in secrets.items:
-                secret_info = {
-                    "name": secret.metadata.name,
-                    "type": secret.type,
-                    "data_keys": list(secret.data.keys()) if secret.data else []
-                }
-                context["secrets"].append(secret_info)
-            
-            # Get Ingresses
+        return context
+
+    def iter_cluster_context_chunks(self, namespace="code-analyzer", force_refresh=False):
+        """Yield (key, items) pairs of the cluster context as each list call completes.
+
+        A failed call yields an empty list for its key followed by ("errors", {key: repr(error)}),
+        except a 404 from the ingress list, which only means the cluster doesn't serve that API.
+        """
+        futures = {}
+        for key, list_fn, namespaced, kwargs in self._list_calls:
+            if namespaced:
+                future = executor.submit(self._collect, key, list_fn, namespace=namespace, **kwargs)
+            else:
+                future = executor.submit(self._collect_cluster_scoped, key, list_fn, force_refresh, **kwargs)
+            futures[future] = key
+
+        for future in as_completed(futures):
+            key = futures[future]
             try:
-                ingresses = self.networking_v1.list_namespaced_ingress(namespace=namespace)
-                for ingress in ingresses.items:
-                    ingress_info = {
-                        "name": ingress.metadata.name,
-                        "hosts": [rule.host for rule in (ingress.spec.rules or []) if rule.host],
-                        "tls": len(ingress.spec.tls or []) > 0,
-                        "class": ingress.spec.ingress_class_name
-                    }
-                    context["ingresses"].append(ingress_info)
-            except Exception:
-                pass  # Ingress might not be available in some clusters
-            
-            # Get ReplicaSets
-            replica_sets = self.apps_v1.list_namespaced_replica_set(namespace=namespace)
-            for rs in replica_sets.items:
-                rs_info = {
-                    "name": rs.metadata.name,
-                    "replicas": rs.spec.replicas,
-                    "ready_replicas": rs.status.ready_replicas or 0,
-                    "available_replicas": rs.status.available_replicas or 0,
-                    "owner": rs.metadata.owner_references[0].name if rs.metadata.owner_references else None
-                }
-                context["replica_sets"].append(rs_info)
-            
-            # Get DaemonSets
-            daemon_sets = self.apps_v1.list_namespaced_daemon_set(namespace=namespace)
-            for ds in daemon_sets.items:
-                ds_info = {
-                    "name": ds.metadata.name,
-                    "desired": ds.status.desired_number_scheduled or 0,
-                    "current": ds.status.current_number_scheduled or 0,
-                    "ready": ds.status.number_ready or 0,
-                    "available": ds.status.number_available or 0
-                }
-                context["daemon_sets"].append(ds_info)
-            
-            # Get StatefulSets
-            stateful_sets = self.apps_v1.list_namespaced_stateful_set(namespace=namespace)
-            for ss in stateful_sets.items:
-                ss_info = {
-                    "name": ss.metadata.name,
-                    "replicas": ss.spec.replicas,
-                    "ready_replicas": ss.status.ready_replicas or 0,
-                    "current_replicas": ss.status.current_replicas or 0,
-                    "updated_replicas": ss.status.updated_replicas or 0
-                }
-                context["stateful_sets"].append(ss_info)
-            
-        except Exception as e:
-            context["error"] = str(e)
-        
-        return context
\ No newline at end of file
+                yield key, future.result()
+            except Exception as e:
+                # A failed kind is left empty; the other calls are unaffected
+                yield key, []
+                if key == "ingresses" and isinstance(e, ApiException) and e.status == 404:
+                    continue  # The Ingress API isn't served by every cluster
+                logger.exception("Listing %s for namespace %s failed", key, namespace)
+                yield "errors", {key: repr(e)}
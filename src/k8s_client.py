@@ -0,0 +1,81 @@
+from kubernetes import client, config
+from threading import BoundedSemaphore, Lock
+import orjson
+import socket
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+# Objects fetched per list request when paging through large collections
+PAGE_SIZE = 500
+
+# Process-wide cap on in-flight list requests, shared by the context fan-out and informer
+# (re-)lists, so bursts from every replica stay within the apiserver's priority-and-fairness budget
+MAX_CONCURRENT_LISTS = 6
+_list_slots = BoundedSemaphore(MAX_CONCURRENT_LISTS)
+
+# Long-lived watch connections the informers may hold open at once; insight sizes its informer
+# namespace cap to fit, and the pool below holds these plus every in-flight list
+MAX_WATCHES = 44
+
+# Seconds a pooled connection may sit idle before TCP keepalive probes start
+KEEPALIVE_IDLE = 60
+
+_api_client = None
+_api_client_lock = Lock()
+
+def _keepalive_socket_options():
+    """Socket options enabling TCP keepalive, so idle pooled connections (and quiet watches) stay
+    open through NAT/conntrack timeouts instead of paying a new TLS handshake on the next request."""
+    options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options += [
+            (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4)
+        ]
+    return options
+
+def get_api_client():
+    """Return the process-wide ApiClient, loading the cluster configuration on first use.
+
+    Every API object shares this client, and so a single urllib3 pool with room for
+    MAX_CONCURRENT_LISTS list calls and MAX_WATCHES informer watches at once.
+    """
+    global _api_client
+    with _api_client_lock:
+        if _api_client is None:
+            try:
+                config.load_incluster_config()
+            except config.ConfigException:
+                config.load_kube_config()
+
+            configuration = client.Configuration.get_default_copy()
+            configuration.connection_pool_maxsize = MAX_WATCHES + MAX_CONCURRENT_LISTS
+            configuration.retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
+            configuration.socket_options = _keepalive_socket_options()
+
+            api_client = client.ApiClient(configuration)
+            # Let the apiserver gzip large list responses; urllib3 decompresses them transparently. Watch
+            # streams are never compressed by the apiserver, so the informers' raw reads are unaffected.
+            api_client.set_default_header("Accept-Encoding", "gzip")
+            _api_client = api_client
+        return _api_client
+
+def list_pages(list_fn, **kwargs):
+    """Yield the pages of a list call as parsed JSON dicts, PAGE_SIZE objects at a time.
+
+    Pages are requested without resourceVersion=0 on purpose: the apiserver's watch cache,
+    which serves resourceVersion=0 reads, ignores limit and returns the whole collection in
+    one response. Paging instead costs a consistent read per page (from etcd, or from the
+    watch cache on clusters with ConsistentListFromCache), but each page is parsed with
+    orjson and can be dropped once consumed, so memory stays bounded by the page size.
+    A slot of MAX_CONCURRENT_LISTS is held only while a page is being fetched.
+    """
+    token = None
+    while True:
+        with _list_slots:
+            page = orjson.loads(list_fn(limit=PAGE_SIZE, _continue=token, _preload_content=False, **kwargs).data)
+        yield page
+        token = page["metadata"].get("continue")
+        if not token:
+            return
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# The app runs from src/ (see Dockerfile), so its modules import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
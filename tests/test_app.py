@@ -0,0 +1,60 @@
+# tests/test_app.py
+import json
+
+import pytest
+from kubernetes import client
+
+import insight
+
+
+class StubInsight:
+    """Yields a fixed set of context chunks, with services failing, in place of the cluster fan-out."""
+
+    def iter_cluster_context_chunks(self, namespace="code-analyzer", force_refresh=False):
+        yield "deployments", [{"name": "app", "replicas": 2, "ready_replicas": 2, "available_replicas": 2}]
+        yield "services", []
+        yield "errors", {"services": "ApiException(403, 'Forbidden')"}
+        yield "replica_sets", [
+            {"name": "app-5d4f", "replicas": 2, "ready_replicas": 2, "available_replicas": 2, "owner": "app"},
+            {"name": "bare", "replicas": 1, "ready_replicas": 1, "available_replicas": 1, "owner": None}
+        ]
+        yield "pods", []
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    # app builds its Insight at import time; give it a client that needs no cluster configuration
+    monkeypatch.setattr(insight, "get_api_client", client.ApiClient)
+    import app
+    monkeypatch.setattr(app, "insight", StubInsight())
+    return app.app.test_client()
+
+
+def test_cluster_status_stream_json(app_client):
+    response = app_client.get("/api/cluster-status/stream?namespace=default&format=json")
+    assert response.mimetype == "application/json"
+
+    body = json.loads(response.get_data())
+    assert body["namespace"] == "default"
+    assert body["timestamp"]
+    assert body["services"] == []
+    assert body["errors"] == {"services": "ApiException(403, 'Forbidden')"}
+    assert [d["name"] for d in body["deployments"]] == ["app"]
+    assert body["indexes"] == {"rs_by_deployment": {"app": ["app-5d4f"]}}
+
+
+def test_cluster_status_stream_json_columns(app_client):
+    response = app_client.get("/api/cluster-status/stream?format=json&layout=columns")
+
+    body = json.loads(response.get_data())
+    assert body["replica_sets"]["name"] == ["app-5d4f", "bare"]
+    assert body["indexes"] == {"rs_by_deployment": {"app": ["app-5d4f"]}}
+
+
+def test_cluster_status_stream_ndjson(app_client):
+    response = app_client.get("/api/cluster-status/stream?namespace=default")
+    assert response.mimetype == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.get_data().splitlines()]
+    assert lines[0]["namespace"] == "default"
+    assert {"errors": {"services": "ApiException(403, 'Forbidden')"}} in lines
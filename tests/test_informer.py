@@ -0,0 +1,172 @@
+# tests/test_informer.py
+import logging
+import queue
+import threading
+import types
+
+import orjson
+from kubernetes import client
+
+import informer
+
+
+def _pod(name, uid, resource_version):
+    return {"metadata": {"name": name, "uid": uid, "resourceVersion": resource_version}}
+
+
+class FakeWatchResponse:
+    """A watch response that sends its events as newline-delimited JSON, then stays open if held."""
+
+    def __init__(self, events, hold):
+        self.body = b"".join(orjson.dumps(event) + b"\n" for event in events)
+        self.hold = hold
+        self.closed = threading.Event()
+
+    def stream(self, amt=None, decode_content=True):
+        # Split mid-line, as chunked transfer does
+        for i in range(0, len(self.body), 7):
+            yield self.body[i:i + 7]
+        if self.hold:
+            self.closed.wait()
+
+    def close(self):
+        self.closed.set()
+
+    def release_conn(self):
+        pass
+
+
+class FakeApi:
+    """A list function serving scripted pages and watches; the last watch stays open until closed."""
+
+    def __init__(self, pages, watches):
+        self.pages = queue.Queue()
+        for page in pages:
+            self.pages.put(page)
+        self.watches = list(watches)
+        self.watch_calls = []
+        self.opened = queue.Queue()
+        self.__name__ = "list_pods"
+
+    def __call__(self, **kwargs):
+        if not kwargs.get("watch"):
+            page = self.pages.get(timeout=5)
+            if isinstance(page, Exception):
+                raise page
+            return types.SimpleNamespace(data=orjson.dumps(page))
+
+        self.watch_calls.append(kwargs)
+        events = self.watches.pop(0) if self.watches else []
+        response = FakeWatchResponse(events, hold=not self.watches)
+        self.opened.put(response)
+        return response
+
+
+def _page(resource_version, *items):
+    return {"metadata": {"resourceVersion": resource_version}, "items": list(items)}
+
+
+def _wait_for_open_watch(api, count):
+    for _ in range(count):
+        response = api.opened.get(timeout=5)
+    return response
+
+
+def test_informer_applies_watch_events():
+    api = FakeApi(
+        [_page("10", _pod("a", "u1", "9"), _pod("b", "u2", "10"))],
+        [
+            [{"type": "ADDED", "object": _pod("c", "u3", "11")},
+             {"type": "DELETED", "object": _pod("a", "u1", "12")},
+             {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "15"}}}],
+            []
+        ]
+    )
+    pods = informer.Informer(api, transform=lambda pod: pod["metadata"]["name"])
+    _wait_for_open_watch(api, 2)
+
+    assert sorted(pods.items()) == ["b", "c"]
+    assert api.watch_calls[0]["resource_version"] == "10"
+    # The second watch resumes from the bookmark rather than re-listing
+    assert api.watch_calls[1]["resource_version"] == "15"
+    assert api.pages.empty()
+    pods.stop()
+
+
+def test_informer_relists_after_gone_event():
+    api = FakeApi(
+        [_page("10", _pod("a", "u1", "10")), _page("20", _pod("b", "u2", "20"))],
+        [
+            [{"type": "ERROR", "object": {"kind": "Status", "code": 410, "reason": "Expired",
+                                          "message": "too old resource version"}}],
+            []
+        ]
+    )
+    pods = informer.Informer(api, transform=lambda pod: pod["metadata"]["name"])
+    _wait_for_open_watch(api, 2)
+
+    assert pods.items() == ["b"]
+    assert api.watch_calls[1]["resource_version"] == "20"
+    assert pods._error is None
+    pods.stop()
+
+
+def test_informer_relists_after_gone_response():
+    pages = [_page("10", _pod("a", "u1", "10")), _page("20", _pod("b", "u2", "20"))]
+    api = FakeApi(pages, [[]])
+    watch = api.__call__
+
+    def gone_once(**kwargs):
+        if kwargs.get("watch") and not api.watch_calls:
+            api.watch_calls.append(kwargs)
+            raise client.ApiException(status=410, reason="Gone")
+        return watch(**kwargs)
+
+    gone_once.__name__ = "list_pods"
+    pods = informer.Informer(gone_once, transform=lambda pod: pod["metadata"]["name"])
+    _wait_for_open_watch(api, 1)
+
+    assert pods.items() == ["b"]
+    assert pods._error is None
+    pods.stop()
+
+
+def test_stop_closes_the_open_watch():
+    api = FakeApi([_page("10")], [[]])
+    pods = informer.Informer(api)
+    response = _wait_for_open_watch(api, 1)
+
+    pods.stop()
+    assert response.closed.is_set()
+    pods._thread.join(5)
+    assert not pods._thread.is_alive()
+
+
+
+def test_stop_while_listing_opens_no_watch():
+    api = FakeApi([], [[]])
+    pods = informer.Informer(api)
+
+    pods.stop()  # The initial list is still waiting for its page
+    api.pages.put(_page("10"))
+    pods._thread.join(5)
+    assert not pods._thread.is_alive()
+    assert api.watch_calls == []
+
+
+def test_failures_back_off_exponentially(monkeypatch, caplog):
+    monkeypatch.setattr(informer, "RETRY_DELAY", 0.01)
+    monkeypatch.setattr(informer, "MAX_RETRY_DELAY", 0.04)
+    forbidden = client.ApiException(status=403, reason="Forbidden")
+    api = FakeApi([forbidden] * 5, [])
+
+    with caplog.at_level(logging.WARNING, logger="informer"):
+        pods = informer.Informer(api)
+        while not api.pages.empty():
+            threading.Event().wait(0.01)
+        pods.stop()
+        pods._thread.join(5)
+
+    delays = [record.args[1] for record in caplog.records if record.name == "informer"]
+    assert delays[:4] == [0.01, 0.02, 0.04, 0.04]
+    assert pods._error is forbidden
@@ -0,0 +1,419 @@
+# tests/test_insight.py
+import threading
+import types
+
+import orjson
+import pytest
+from kubernetes import client
+
+import insight
+
+_LIST_METHODS = {
+    "nodes": (client.CoreV1Api, "list_node"),
+    "pods": (client.CoreV1Api, "list_namespaced_pod"),
+    "deployments": (client.AppsV1Api, "list_namespaced_deployment"),
+    "services": (client.CoreV1Api, "list_namespaced_service"),
+    "events": (client.CoreV1Api, "list_namespaced_event"),
+    "persistent_volumes": (client.CoreV1Api, "list_persistent_volume"),
+    "persistent_volume_claims": (client.CoreV1Api, "list_namespaced_persistent_volume_claim"),
+    "config_maps": (client.CoreV1Api, "list_namespaced_config_map"),
+    "secrets": (client.CoreV1Api, "list_namespaced_secret"),
+    "ingresses": (client.NetworkingV1Api, "list_namespaced_ingress"),
+    "replica_sets": (client.AppsV1Api, "list_namespaced_replica_set"),
+    "daemon_sets": (client.AppsV1Api, "list_namespaced_daemon_set"),
+    "stateful_sets": (client.AppsV1Api, "list_namespaced_stateful_set"),
+}
+
+
+class _OpenWatch:
+    """A watch response with no events that stays open until closed."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def stream(self, amt=None, decode_content=True):
+        self.closed.wait()
+        return iter(())
+
+    def close(self):
+        self.closed.set()
+
+    def release_conn(self):
+        pass
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """Serve every list call from in-memory pages; set items[kind] or errors[kind] to shape a call."""
+    cluster = types.SimpleNamespace(items={}, errors={}, calls={kind: 0 for kind in _LIST_METHODS})
+
+    def fake_list(kind):
+        def list_fn(self, *args, **kwargs):
+            if kwargs.get("watch"):
+                return _OpenWatch()
+            cluster.calls[kind] += 1
+            if kind in cluster.errors:
+                raise cluster.errors[kind]
+            page = {"metadata": {"resourceVersion": "1"}, "items": cluster.items.get(kind, [])}
+            return types.SimpleNamespace(data=orjson.dumps(page))
+        return list_fn
+
+    for kind, (api, method) in _LIST_METHODS.items():
+        monkeypatch.setattr(api, method, fake_list(kind))
+    return cluster
+
+
+def test_build_node_info():
+    node = {
+        "metadata": {"name": "node-1"},
+        "status": {
+            "capacity": {"cpu": "4", "memory": "16Gi"},
+            "conditions": [
+                {"type": "MemoryPressure", "status": "False"},
+                {"type": "Ready", "status": "True"}
+            ]
+        }
+    }
+    assert insight._build_node_info(node) == {
+        "name": "node-1",
+        "status": "Ready",
+        "cpu_capacity": "4",
+        "memory_capacity": "16Gi",
+        "conditions": [
+            {"type": "MemoryPressure", "status": "False"},
+            {"type": "Ready", "status": "True"}
+        ]
+    }
+
+
+def test_build_node_info_without_conditions():
+    info = insight._build_node_info({"metadata": {"name": "node-1"}, "status": {}})
+    assert info["status"] == "NotReady"
+    assert info["cpu_capacity"] is None
+    assert info["conditions"] == []
+
+
+def test_build_container_info():
+    container = {
+        "name": "app",
+        "image": "app:1.0",
+        "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+        "resources": {"requests": {"cpu": "100m"}},
+        "env": [{"name": "A", "value": "1"}, {"name": "B", "value": "2"}],
+        "volumeMounts": [{"name": "data", "mountPath": "/data"}]
+    }
+    assert insight._build_container_info(container) == {
+        "name": "app",
+        "image": "app:1.0",
+        "ports": [{"container_port": 8080, "protocol": "TCP"}],
+        "resources": {"requests": {"cpu": "100m"}, "limits": {}},
+        "env_vars": 2,
+        "volume_mounts": [{"name": "data", "mount_path": "/data"}]
+    }
+
+
+def test_build_container_status_info_terminated_last_state():
+    status = {
+        "name": "app",
+        "ready": False,
+        "restartCount": 3,
+        "state": {"waiting": {"reason": "CrashLoopBackOff", "message": "back-off"}},
+        "lastState": {"terminated": {"reason": "Error", "exitCode": 1, "finishedAt": "2024-01-01T00:00:00Z"}}
+    }
+    assert insight._build_container_status_info(status) == {
+        "name": "app",
+        "ready": False,
+        "restart_count": 3,
+        "state": {"status": "waiting", "reason": "CrashLoopBackOff", "message": "back-off"},
+        "last_state": {"status": "terminated", "reason": "Error", "exit_code": 1,
+                       "finished_at": "2024-01-01T00:00:00Z"}
+    }
+
+
+def test_build_container_status_info_empty_state():
+    info = insight._build_container_status_info({"name": "app", "state": {}, "lastState": {}})
+    assert info["state"] == {}
+    assert info["last_state"] == {}
+    assert info["restart_count"] == 0
+
+
+def test_build_volume_info():
+    assert insight._build_volume_info({"name": "cfg", "configMap": {"name": "app-config"}}) == {
+        "name": "cfg", "type": "configMap", "config_map_name": "app-config"}
+    assert insight._build_volume_info({"name": "tls", "secret": {"secretName": "app-tls"}}) == {
+        "name": "tls", "type": "secret", "secret_name": "app-tls"}
+    assert insight._build_volume_info({"name": "data", "persistentVolumeClaim": {"claimName": "app-data"}}) == {
+        "name": "data", "type": "persistentVolumeClaim", "pvc_name": "app-data"}
+    assert insight._build_volume_info({"name": "logs", "hostPath": {"path": "/var/log"}}) == {
+        "name": "logs", "type": "hostPath", "host_path": "/var/log"}
+    assert insight._build_volume_info({"name": "other", "projected": {}}) == {"name": "other", "type": "unknown"}
+
+
+def test_build_volume_info_empty_dir():
+    # emptyDir is usually sent as an empty object
+    assert insight._build_volume_info({"name": "tmp", "emptyDir": {}}) == {"name": "tmp", "type": "emptyDir"}
+
+
+def test_build_pod_info():
+    pod = {
+        "metadata": {
+            "name": "app-1",
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "labels": {"app": "app"},
+            "annotations": {"kubectl.kubernetes.io/restartedAt": "now", "team": "core"}
+        },
+        "spec": {
+            "nodeName": "node-1",
+            "serviceAccountName": "default",
+            "restartPolicy": "Always",
+            "dnsPolicy": "ClusterFirst",
+            "containers": [{"name": "app"}, {"name": "sidecar"}],
+            "volumes": [{"name": "tmp", "emptyDir": {}}]
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": "10.0.0.5",
+            "hostIP": "192.168.0.1",
+            "qosClass": "Burstable",
+            "conditions": [{"type": "Ready", "status": "False", "reason": "ContainersNotReady"}],
+            "containerStatuses": [
+                {"name": "app", "ready": True, "restartCount": 2, "state": {"running": {"startedAt": "t"}}},
+                {"name": "sidecar", "ready": False, "restartCount": 1, "state": {}}
+            ]
+        }
+    }
+    info = insight._build_pod_info(pod)
+    assert info["name"] == "app-1"
+    assert info["status"] == "Running"
+    assert info["ready"] == 1
+    assert info["total_containers"] == 2
+    assert info["restart_count"] == 3
+    assert info["node"] == "node-1"
+    assert info["annotations"] == {"team": "core"}
+    assert info["pod_ip"] == "10.0.0.5"
+    assert info["qos_class"] == "Burstable"
+    assert [c["name"] for c in info["containers"]] == ["app", "sidecar"]
+    assert info["container_statuses"][0]["state"] == {"status": "running", "started_at": "t"}
+    assert info["container_statuses"][1]["state"] == {}
+    assert info["conditions"] == [{"type": "Ready", "status": "False", "reason": "ContainersNotReady",
+                                   "message": None, "last_transition_time": None}]
+    assert info["volumes"] == [{"name": "tmp", "type": "emptyDir"}]
+
+
+def test_build_pod_info_pending():
+    # A pod that was just created has no status beyond its phase
+    pod = {"metadata": {"name": "app-1"}, "spec": {"containers": [{"name": "app"}]}, "status": {"phase": "Pending"}}
+    info = insight._build_pod_info(pod)
+    assert info["ready"] == 0
+    assert info["restart_count"] == 0
+    assert info["container_statuses"] == []
+    assert info["conditions"] == []
+    assert info["volumes"] == []
+    assert info["labels"] == {}
+
+
+def test_build_deployment_info():
+    deployment = {"metadata": {"name": "app"}, "spec": {"replicas": 3}, "status": {"readyReplicas": 2}}
+    assert insight._build_deployment_info(deployment) == {
+        "name": "app", "replicas": 3, "ready_replicas": 2, "available_replicas": 0}
+
+
+def test_build_service_info():
+    service = {"metadata": {"name": "app"}, "spec": {"type": "ClusterIP", "clusterIP": "10.96.0.10"}}
+    assert insight._build_service_info(service) == {"name": "app", "type": "ClusterIP", "cluster_ip": "10.96.0.10"}
+
+
+def test_build_event_info():
+    event = {
+        "metadata": {"name": "app-1.17a"},
+        "type": "Warning",
+        "reason": "BackOff",
+        "message": "Back-off restarting failed container",
+        "involvedObject": {"kind": "Pod", "name": "app-1"}
+    }
+    assert insight._build_event_info(event) == {
+        "type": "Warning", "reason": "BackOff", "message": "Back-off restarting failed container",
+        "object": "Pod/app-1"}
+
+
+def test_build_pv_info():
+    pv = {
+        "metadata": {"name": "pv-1"},
+        "spec": {"capacity": {"storage": "10Gi"}, "accessModes": ["ReadWriteOnce"],
+                 "persistentVolumeReclaimPolicy": "Delete", "storageClassName": "standard"},
+        "status": {"phase": "Bound"}
+    }
+    assert insight._build_pv_info(pv) == {
+        "name": "pv-1", "capacity": "10Gi", "access_modes": ["ReadWriteOnce"], "status": "Bound",
+        "reclaim_policy": "Delete", "storage_class": "standard"}
+
+
+def test_build_pvc_info():
+    pvc = {
+        "metadata": {"name": "data"},
+        "spec": {"accessModes": ["ReadWriteOnce"], "storageClassName": "standard", "volumeName": "pv-1"},
+        "status": {"phase": "Bound", "capacity": {"storage": "10Gi"}}
+    }
+    assert insight._build_pvc_info(pvc) == {
+        "name": "data", "status": "Bound", "capacity": "10Gi", "access_modes": ["ReadWriteOnce"],
+        "storage_class": "standard", "volume_name": "pv-1"}
+
+
+def test_build_pvc_info_pending():
+    info = insight._build_pvc_info({"metadata": {"name": "data"}, "spec": {}})
+    assert info["status"] is None
+    assert info["capacity"] is None
+    assert info["access_modes"] == []
+
+
+def test_build_config_map_info():
+    cm = {"metadata": {"name": "app-config"}, "data": {"a": "1", "b": "2"}, "binaryData": {"c": "AA=="}}
+    assert insight._build_config_map_info(cm) == {
+        "name": "app-config", "data_keys": ["a", "b"], "binary_data_keys": ["c"]}
+
+
+def test_build_secret_info():
+    secret = {"metadata": {"name": "app-tls"}, "type": "kubernetes.io/tls",
+              "data": {"tls.crt": "Y2VydA==", "tls.key": "a2V5"}}
+    assert insight._build_secret_info(secret) == {
+        "name": "app-tls", "type": "kubernetes.io/tls", "data_keys": ["tls.crt", "tls.key"]}
+
+
+def test_build_ingress_info():
+    ingress = {
+        "metadata": {"name": "app"},
+        "spec": {"ingressClassName": "nginx", "tls": [{"hosts": ["app.example.com"]}],
+                 "rules": [{"host": "app.example.com"}, {"http": {}}]}
+    }
+    assert insight._build_ingress_info(ingress) == {
+        "name": "app", "hosts": ["app.example.com"], "tls": True, "class": "nginx"}
+
+
+def test_build_replica_set_info():
+    rs = {
+        "metadata": {"name": "app-5d4f", "ownerReferences": [{"kind": "Deployment", "name": "app"}]},
+        "spec": {"replicas": 2},
+        "status": {"readyReplicas": 2, "availableReplicas": 2}
+    }
+    assert insight._build_replica_set_info(rs) == {
+        "name": "app-5d4f", "replicas": 2, "ready_replicas": 2, "available_replicas": 2, "owner": "app"}
+    assert insight._build_replica_set_info({"metadata": {"name": "bare"}, "spec": {}})["owner"] is None
+
+
+def test_build_daemon_set_info():
+    ds = {"metadata": {"name": "agent"},
+          "status": {"desiredNumberScheduled": 3, "currentNumberScheduled": 3, "numberReady": 2}}
+    assert insight._build_daemon_set_info(ds) == {
+        "name": "agent", "desired": 3, "current": 3, "ready": 2, "available": 0}
+
+
+def test_build_stateful_set_info():
+    ss = {"metadata": {"name": "db"}, "spec": {"replicas": 3},
+          "status": {"readyReplicas": 1, "currentReplicas": 3, "updatedReplicas": 3}}
+    assert insight._build_stateful_set_info(ss) == {
+        "name": "db", "replicas": 3, "ready_replicas": 1, "current_replicas": 3, "updated_replicas": 3}
+
+
+def test_recent_events_keeps_latest_five_newest_first():
+    events = [{"metadata": {"name": f"e{i}", "creationTimestamp": f"2024-01-01T00:00:{i:02d}Z"}} for i in range(8)]
+    events.append({"metadata": {"name": "undated"}})
+    recent = insight._recent_events(events)
+    assert [e["metadata"]["name"] for e in recent] == ["e7", "e6", "e5", "e4", "e3"]
+
+
+def test_cluster_context_is_cached_even_with_errors(cluster):
+    cluster.errors["services"] = client.ApiException(status=403, reason="Forbidden")
+    ins = insight.Insight(api_client=client.ApiClient())
+
+    context = ins.get_cluster_context("default")
+    assert context["services"] == []
+    assert "services" in context["errors"]
+
+    # A kind that keeps failing must not defeat the cache
+    assert ins.get_cluster_context("default") is context
+    assert cluster.calls["pods"] == 1
+    ins.get_cluster_context("default", force_refresh=True)
+    assert cluster.calls["pods"] == 2
+
+
+
+def test_informers_are_stopped_for_least_recently_used_namespaces(cluster, monkeypatch):
+    monkeypatch.setattr(insight, "MAX_INFORMER_NAMESPACES", 2)
+    ins = insight.Insight(api_client=client.ApiClient(), use_informers=True)
+
+    ins.get_cluster_context("a")
+    evicted = list(ins._informers["a"].values())
+    for namespace in ("b", "c"):
+        ins.get_cluster_context(namespace)
+
+    assert sorted(ins._informers) == ["b", "c"]
+    for inf in evicted:
+        inf._thread.join(5)
+        assert not inf._thread.is_alive()
+    # The cluster-scoped informers namespace a started are shared and kept
+    assert len(ins._cluster_informers) == 2
+    assert not any(inf._stopped.is_set() for inf in ins._cluster_informers.values())
+    assert not any(inf._stopped.is_set() for inf in ins._informers["c"].values())
+
+
+def test_missing_ingress_api_is_not_an_error(cluster):
+    cluster.errors["ingresses"] = client.ApiException(status=404, reason="Not Found")
+    context = insight.Insight(api_client=client.ApiClient()).get_cluster_context("default")
+    assert context["ingresses"] == []
+    assert context["errors"] == {}
+
+
+def test_other_ingress_failures_are_reported(cluster):
+    cluster.errors["ingresses"] = client.ApiException(status=403, reason="Forbidden")
+    context = insight.Insight(api_client=client.ApiClient()).get_cluster_context("default")
+    assert context["ingresses"] == []
+    assert list(context["errors"]) == ["ingresses"]
+
+
+def test_to_columns_has_fixed_fields_per_kind():
+    assert insight.to_columns("services", []) == {"name": [], "type": [], "cluster_ip": []}
+    entries = [{"name": "a", "type": "ClusterIP", "cluster_ip": "10.0.0.1"},
+               {"name": "b", "type": "NodePort", "cluster_ip": "10.0.0.2"}]
+    assert insight.to_columns("services", entries) == {
+        "name": ["a", "b"], "type": ["ClusterIP", "NodePort"], "cluster_ip": ["10.0.0.1", "10.0.0.2"]}
+
+
+def test_fields_match_builders():
+    minimal = {
+        "nodes": {"metadata": {"name": "n"}, "status": {}},
+        "pods": {"metadata": {"name": "p"}, "spec": {"containers": []}},
+        "events": {"metadata": {"name": "e"}, "involvedObject": {}},
+    }
+    for kind, builder in insight._BUILDERS.items():
+        obj = minimal.get(kind, {"metadata": {"name": "x"}, "spec": {}})
+        assert tuple(builder(obj)) == insight._FIELDS[kind], kind
+
+
+def test_informer_watches_fit_in_the_connection_pool():
+    ins = insight.Insight(api_client=client.ApiClient())
+    namespaced = sum(1 for _, _, is_namespaced, _ in ins._list_calls if is_namespaced)
+    cluster_scoped = len(ins._list_calls) - namespaced
+    assert insight.MAX_INFORMER_NAMESPACES >= 1
+    assert insight.MAX_INFORMER_NAMESPACES * namespaced + cluster_scoped <= insight.MAX_WATCHES
+
+
+def test_cluster_scoped_kinds_are_shared_across_namespaces(cluster):
+    ins = insight.Insight(api_client=client.ApiClient())
+    ins.get_cluster_context("a")
+    ins.get_cluster_context("b")
+    assert cluster.calls["nodes"] == 1
+    assert cluster.calls["persistent_volumes"] == 1
+    assert cluster.calls["pods"] == 2
+
+    ins.get_cluster_context("b", force_refresh=True)
+    assert cluster.calls["nodes"] == 2
+
+
+def test_cluster_scoped_kinds_skip_the_ttl_cache_with_informers(cluster):
+    cluster.items["nodes"] = [{"metadata": {"name": "node-1", "uid": "u1", "resourceVersion": "1"}, "status": {}}]
+    ins = insight.Insight(api_client=client.ApiClient(), use_informers=True)
+    ins.get_cluster_context("a")
+
+    ins._cluster_informers[ins.v1.list_node]._objects.clear()  # As a DELETED event would
+    ins._ctx_cache.clear()
+    assert ins.get_cluster_context("a")["nodes"] == []